@@ -0,0 +1,152 @@
+""" runs every registered sorting method headlessly over sizes & input distributions, on every core.
+`python benchmark.py --sizes 10 1000 100000 --repeats 3 --results results.jsonl` (re-run to resume) """
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from datasets import get_distributions, load
+from engine import COUNTERS, SortEngine
+from methods import METHODS
+
+DEFAULT_SIZES = [10, 100, 1000, 10_000, 100_000, 1_000_000]
+COLUMNS = [("method", 20), ("distribution", 14), ("size", 9), ("seed", 6), ("time (s)", 10), ("operations", 12),
+           ("comparisons", 12), ("swaps", 12), ("reads", 12), ("writes", 12), ("aux writes", 12), ("peak (KiB)", 11)]
+
+
+def run_cell(method, distribution, size, seed=0, timeout=10.0) -> dict:
+    """ times a run (counted by the engine), then repeats it to measure peak memory. gives up on runs over `timeout` seconds """
+    items = load(distribution, size, seed)
+    result = {"method": method, "distribution": distribution, "size": size, "seed": seed, "completed": False}
+
+    engine = SortEngine(method)
+    engine.load_items(items)
+    start = time.perf_counter()
+    completed = engine.run_for(timeout, batch=4096)
+    result["time"] = time.perf_counter() - start
+    result.update(engine.get_counters())
+    if not completed:
+        return result
+    if engine.items != sorted(items):
+        raise RuntimeError(f"{method} did not sort {distribution} ({size} items)")
+
+    # memory run
+    tracemalloc.start()
+    engine = SortEngine(method)
+    engine.load_items(items)
+    engine.run()
+    result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result["completed"] = True
+    return result
+
+
+def load_results(path) -> list[dict]:
+    """ results already in a JSON lines file, a line cut off by an interruption is ignored """
+    results = []
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+    return results
+
+
+def run_benchmark(methods, distributions, sizes, seeds=(0,), timeout=10.0, workers=None, done=()):
+    """ yields the result of every cell as it completes, over a process per core. each (method, distribution, seed) runs its
+    sizes smallest first, skipping those above one that timed out. cells in `done` (earlier results) aren't run again """
+    done = {(r["method"], r["distribution"], r["size"], r["seed"]): r["completed"] for r in done}
+
+    # sizes still to run of each chain
+    chains = {}
+    for method in methods:
+        for distribution in distributions:
+            for seed in seeds:
+                chain = []
+                for size in sorted(sizes):
+                    completed = done.get((method, distribution, size, seed))
+                    if completed is False:
+                        break
+                    if completed is None:
+                        chain.append(size)
+                if chain:
+                    chains[(method, distribution, seed)] = chain
+
+    with ProcessPoolExecutor(workers) as pool:
+        def submit(key):
+            method, distribution, seed = key
+            pending[pool.submit(run_cell, method, distribution, chains[key].pop(0), seed, timeout)] = key
+
+        pending = {}
+        for key in chains:
+            submit(key)
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = pending.pop(future)
+                result = future.result()
+                yield result
+                if result["completed"] and chains[key]:
+                    submit(key)
+
+
+def format_row(values) -> str:
+    return " ".join(f"{value:<{width}}" if i < 2 else f"{value:>{width}}" for i, (value, (_, width)) in enumerate(zip(values, COLUMNS)))
+
+
+def format_result(result: dict) -> str:
+    if not result["completed"]:
+        return format_row([result["method"], result["distribution"], result["size"], result["seed"],
+                           f"> {result['time']:.2f}", f"{result['operations']}+", "timed out", "", "", "", "", ""])
+    return format_row([result["method"], result["distribution"], result["size"], result["seed"], f"{result['time']:.4f}", result["operations"],
+                       *(result[counter] for counter in COUNTERS), f"{result['peak_memory'] / 1024:.1f}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the sorting methods headlessly")
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=list(METHODS), metavar="METHOD")
+    parser.add_argument("--distributions", nargs="+", default=get_distributions(), choices=get_distributions(), metavar="DISTRIBUTION")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1, help="runs of each cell, seeded from --seed up")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per run before larger sizes are skipped")
+    parser.add_argument("--workers", type=int, default=None, help="processes to run cells over, defaults to one per core")
+    parser.add_argument("--results", help="append each result to this JSON lines file as it completes, cells already in it are skipped")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    done = load_results(args.results)
+    if done:
+        print(f"resuming, {len(done)} results in {args.results}")
+    seeds = range(args.seed, args.seed + args.repeats)
+
+    print(format_row([name for name, _ in COLUMNS]))
+    results = []
+    out = open(args.results, "a+") if args.results else None
+    if out is not None and out.tell():
+        out.seek(out.tell() - 1)
+        if out.read(1) != "\n":
+            out.write("\n")  # after a line cut off by an interruption
+    try:
+        for result in run_benchmark(args.methods, args.distributions, args.sizes, seeds, args.timeout, args.workers, done):
+            print(format_result(result), flush=True)
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out is not None:
+            out.close()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seed": args.seed, "repeats": args.repeats, "timeout": args.timeout, "results": done + results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
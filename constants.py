@@ -11,8 +11,49 @@ class SortingMethods:
     COCKTAIL = "Cocktail Shaker"
     MERGE = "Merge"
     SIMPLE_QUICK = "(Simple) Quick"
+    QUICK_LOMUTO = "Quick (Lomuto)"
+    QUICK_HOARE = "Quick (Hoare)"
+    QUICK_RANDOM = "Quick (Random)"
     HEAP = "Heap"
+    INTRO = "Intro"
+    TIM = "Tim"
     RADIX = "(LSD) Radix"
+    RADIX_2 = "(LSD) Radix 2"
+    RADIX_16 = "(LSD) Radix 16"
+    RADIX_256 = "(LSD) Radix 256"
+
+
+class Distributions:
+    RANDOM = "random"
+    SORTED = "sorted"
+    REVERSED = "reversed"
+    NEARLY_SORTED = "nearly sorted"
+    FEW_UNIQUE = "few unique"
+    ORGAN_PIPE = "organ pipe"
+    K_SORTED = "k-sorted"
+    SAWTOOTH = "sawtooth"
+    GAUSSIAN = "gaussian"
+
+
+class Partitions:
+    LOMUTO = "lomuto"
+    HOARE = "hoare"
+
+
+class Pivots:
+    LAST = "last"
+    MEDIAN_OF_THREE = "median of three"
+    RANDOM = "random"
+
+
+class Ops:
+    """ operation event codes, recorded by the engine as (op, a, b) """
+    COMPARE = 0  # a, b: indices compared
+    SWAP = 1  # a, b: indices swapped
+    WRITE = 2  # a: index written, b: value
+    HIGHLIGHT = 3  # a: index whose completed state changed without a write
+    COPY = 4  # a, b: items[a:b] copied into the same place in the auxiliary buffer
+    COMPARE_AUX = 5  # a, b: indices in the auxiliary buffer compared
 
 
 class Texts:
@@ -25,6 +66,7 @@ class Texts:
     MARGIN = "Margin"
     SORTING_METHOD = "Sorting Method:"
     SORT = "Sort"
+    RACE = "Race"
     SOUND = "Toggle sound"
 
     FRAMES = "frames"
@@ -32,6 +74,11 @@ class Texts:
     OPERATIONS = "operations"
     SORTED = "sorted"
     AVERAGE_OP = "average operations"
+    COMPARISONS = "comparisons"
+    SWAPS = "swaps"
+    READS = "reads"
+    WRITES = "writes"
+    AUX_WRITES = "aux writes"
 
 
 class GameValues:
@@ -41,10 +88,19 @@ class GameValues:
     MIN_FRAMES = 0
     MIN_MARGIN = 30
 
-    MAX_ITEMS = 540
+    MAX_ITEMS = 1_000_000  # above the sorter's width in pixels items are binned into columns
     MAX_FRAMES = 100
     MAX_MARGIN = 200
 
+    MAX_SPEED_SHARE = 0.6  # of the time since the last frame spent sorting when frames / op is 0, the rest is for rendering & input
+    MAX_SPEED_BUDGET = 0.05  # seconds of sorting in one frame at most, so a stalled frame isn't followed by a longer one
+    SIM_RATE = 120  # simulation ticks / second, what frames / op counts
+    MAX_TICKS_PER_FRAME = 8  # caught up on at most, after a slow frame
+    IDLE_WAIT = 500  # ms waited for an event before redrawing anyway, when not sorting
+    SEEK_STEPS = 100  # a replay is scrubbed through in this many presses of the arrow keys
+    HIT_CELL = 50  # px, of the grid widgets are indexed by for hover & clicks
+    MAX_DIRTY_RECTS = 32  # separate runs of changed columns pushed to the display, past that one rect around them all
+
     SCREEN_WIDTH = 800
     SCREEN_HEIGHT = 800
     RES_MUL = 1
@@ -0,0 +1,113 @@
+""" seeded input items, `load()` caches big ones on disk so they're generated once & identical across machines """
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+
+from constants import *
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".datasets")
+CACHE_MIN_SIZE = 10_000  # smaller are quicker to generate than to read
+MAGIC = b"SORTDAT"
+HEADER = struct.Struct("<7sxQ")  # magic, item num. then the items as little endian int64s
+
+K_SORTED_DISTANCE = 16  # no item of a k-sorted input is further than this from its place
+SAWTOOTH_TEETH = 8
+FEW_UNIQUE_LEVELS = 8
+
+
+def generate(distribution, size, rng: random.Random) -> list[int]:
+    """ `size` items in the given arrangement, values are 1..size (a permutation unless few unique / gaussian) """
+    if distribution == Distributions.RANDOM:
+        items = list(range(1, size + 1))
+        rng.shuffle(items)
+        return items
+    if distribution == Distributions.SORTED:
+        return list(range(1, size + 1))
+    if distribution == Distributions.REVERSED:
+        return list(range(size, 0, -1))
+    if distribution == Distributions.NEARLY_SORTED:
+        # sorted, with 2% of items swapped with a random other
+        items = list(range(1, size + 1))
+        for _ in range(size // 50 if size >= 50 else min(size, 1)):
+            a, b = rng.randrange(size), rng.randrange(size)
+            items[a], items[b] = items[b], items[a]
+        return items
+    if distribution == Distributions.FEW_UNIQUE:
+        # a few different values, spread out over 1..size
+        levels = min(FEW_UNIQUE_LEVELS, size)
+        return [max(1, ((rng.randrange(levels) + 1) * size) // levels) for _ in range(size)]
+    if distribution == Distributions.ORGAN_PIPE:
+        # odds ascending, then evens descending
+        return [*range(1, size + 1, 2), *range(size - (size % 2), 0, -2)]
+    if distribution == Distributions.K_SORTED:
+        # each item jittered by less than k places
+        keys = [i + rng.random() * K_SORTED_DISTANCE for i in range(size)]
+        return [i + 1 for i in sorted(range(size), key=keys.__getitem__)]
+    if distribution == Distributions.SAWTOOTH:
+        # ascending runs, tooth t holds every teeth-th value from t + 1
+        teeth = min(SAWTOOTH_TEETH, max(size, 1))
+        return [item for tooth in range(teeth) for item in range(tooth + 1, size + 1, teeth)]
+    if distribution == Distributions.GAUSSIAN:
+        # normal around the middle, clamped to 1..size
+        return [min(size, max(1, round(rng.gauss(size / 2, size / 6)))) for _ in range(size)]
+    raise ValueError(f"distribution {distribution} is not known. look at datasets.generate()")
+
+
+def get_distributions() -> list[str]:
+    return [v for k, v in vars(Distributions).items() if not k.startswith('_')]
+
+
+def get_cache_path(distribution, size, seed) -> str:
+    return os.path.join(CACHE_DIR, f"{distribution.replace(' ', '-')}_{size}_{seed}.bin")
+
+
+def write(path, items: array):
+    """ written to a temporary file of its own first, so an interrupted write never leaves a broken dataset & processes writing
+    the same one at once (benchmark workers) don't trip over each other, the last to finish replaces the others' """
+    if sys.byteorder == "big":
+        items = array('q', items)
+        items.byteswap()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(path), dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(items)))
+            items.tofile(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read(path) -> array:
+    """ a copy straight out of the memory mapped file """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, size = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + size * 8:
+            raise ValueError(f"{path} is not a dataset")
+        items = array('q')
+        with memoryview(data) as view:
+            items.frombytes(view[HEADER.size:])
+    if sys.byteorder == "big":
+        items.byteswap()
+    return items
+
+
+def load(distribution, size, seed=0, cache=True) -> array:
+    """ the same items for the same (distribution, size, seed) anywhere, read from the cache if generated before """
+    path = get_cache_path(distribution, size, seed)
+    cache = cache and size >= CACHE_MIN_SIZE
+    if cache and os.path.exists(path):
+        try:
+            return read(path)
+        except ValueError:
+            pass  # regenerated below
+
+    items = array('q', generate(distribution, size, random.Random(seed)))
+    if cache:
+        write(path, items)
+    return items
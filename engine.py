@@ -0,0 +1,216 @@
+import random
+import time
+from array import array
+
+import datasets
+from constants import *
+from methods import MethodSorter, get_method_sorter
+
+COUNTERS = ["comparisons", "swaps", "reads", "writes", "aux_writes"]  # the engine's cost counters, attributes of the same names
+
+
+class SortEngine:
+    """ Headless sorting state, steps any registered method on a plain list of ints (no pygame, no sound) """
+    def __init__(self, sorting_method=SortingMethods.BUBBLE, on_sound=None, on_complete=None, typed_items=False):
+        self.on_sound = on_sound  # called with the item being moved
+        self.on_complete = on_complete  # called once the method finishes
+        self.typed_items = typed_items  # items & target as array('q'), a bit slower to step but viewable by numpy without copying
+
+        self.item_num = 0
+        self.items: list[int] | array = []
+        self.target: list[int] | array = []  # items once sorted
+        self.placed: set[int] = set()  # indices of items that match `target`
+        self.aux: list[int] = []  # auxiliary buffer, allocated by the first `Ops.COPY`
+
+        self.sorting_method = sorting_method
+        self.method: MethodSorter = get_method_sorter(self.sorting_method)(self)
+
+        self.completed = False
+        self.operation_num = 0
+        self.comparisons = self.swaps = self.reads = self.writes = self.aux_writes = 0
+        self.last_op: tuple[int, int, int] | None = None
+        self.result = None  # sent back to the method for its last op
+        self.events: array | None = None  # flat (op, a, b) triples, see `record_events()`
+        self.trace = None  # a `tracefile.TraceWriter` that taken events are also written to
+
+    def load_items(self, items):
+        """ (re)start the current method on a copy of `items` """
+        if self.trace is not None:
+            self.trace.close()
+        self.items = array('q', items) if self.typed_items else list(items)
+        self.item_num = len(self.items)
+        self.target = array('q', sorted(self.items)) if self.typed_items else sorted(self.items)
+        self.placed = {i for i, (item, t) in enumerate(zip(self.items, self.target)) if item == t}
+        self.aux = []
+        self.method = get_method_sorter(self.sorting_method)(self)
+        self.completed = False
+        self.operation_num = 0
+        self.comparisons = self.swaps = self.reads = self.writes = self.aux_writes = 0
+        self.last_op = None
+        self.result = None
+        if self.events is not None:
+            self.events = array('q')
+
+    def generate_items(self, item_num, distribution=Distributions.RANDOM, seed=None, cache=True):
+        """ seeded items (see `datasets.load`), or a one off shuffle without a seed """
+        if seed is None:
+            self.load_items(datasets.load(distribution, item_num, random.randrange(1 << 32), cache=False))
+        else:
+            self.load_items(datasets.load(distribution, item_num, seed, cache))
+
+    def change_sorting_method(self, method):
+        self.sorting_method = method
+        self.load_items(self.items)
+
+    def validator(self, value) -> str:
+        return self.method.validator(value)
+
+    def step(self) -> bool:
+        """ perform the method's next operation, returns if the sort is complete """
+        return self.run(1)
+
+    def run(self, max_ops=None) -> bool:
+        """ perform the method's operations until it finishes (or `max_ops` operations), returns if the sort is complete """
+        if self.completed:
+            return True
+
+        send = self.method.operations.send
+        result, op, ops = self.result, self.last_op, 0
+        try:
+            while max_ops is None or ops < max_ops:
+                op = send(result)
+                ops += 1
+                kind, a, b = op
+                if kind == Ops.COMPARE:
+                    result = self.compare(a, b)
+                    continue
+                if kind == Ops.COMPARE_AUX:
+                    result = self.compare_aux(a, b)
+                    continue
+                result = None
+                if kind == Ops.SWAP:
+                    self.swap_items(a, b)
+                elif kind == Ops.WRITE:
+                    self.write_item(a, b)
+                elif kind == Ops.COPY:
+                    self.copy_to_aux(a, b)
+                else:
+                    self.highlight(a)
+        except StopIteration:
+            self.complete_sorting()
+
+        self.result, self.last_op = result, op
+        self.operation_num += ops
+        return self.completed
+
+    def run_for(self, seconds, batch=64) -> bool:
+        """ run until the method finishes or `seconds` have passed (clock checked every `batch` operations), returns if the sort is complete """
+        end = time.perf_counter() + seconds
+        while not self.completed and time.perf_counter() < end:
+            self.run(batch)
+        return self.completed
+
+    def record_events(self, record=True):
+        """ start (or stop) recording operation events, off by default so headless runs don't pay for them """
+        self.events = array('q') if record else None
+
+    def take_events(self) -> array:
+        """ returns the events recorded since the last call and starts a new log """
+        events = self.events
+        if events is not None:
+            self.events = array('q')
+            if self.trace is not None:
+                self.trace.write_events(events)
+        return events
+
+    def apply(self, kind, a, b):
+        """ perform a recorded operation, without the method """
+        if kind == Ops.COMPARE:
+            self.compare(a, b)
+        elif kind == Ops.COMPARE_AUX:
+            self.compare_aux(a, b)
+        elif kind == Ops.SWAP:
+            self.swap_items(a, b)
+        elif kind == Ops.WRITE:
+            self.write_item(a, b)
+        elif kind == Ops.COPY:
+            self.copy_to_aux(a, b)
+        else:
+            self.highlight(a)
+
+    def complete_sorting(self):
+        if self.trace is not None:
+            self.trace.close()
+        if not self.completed:
+            self.completed = True
+            if self.on_complete is not None:
+                self.on_complete()
+
+    def get_counters(self) -> dict[str, int]:
+        return {"operations": self.operation_num, **{counter: getattr(self, counter) for counter in COUNTERS}}
+
+    def compare(self, a, b) -> bool:
+        """ returns if the item at `a` is greater than the item at `b` """
+        self.comparisons += 1
+        self.reads += 2
+        if self.events is not None:
+            self.events.extend((Ops.COMPARE, a, b))
+        return self.items[a] > self.items[b]
+
+    def compare_aux(self, a, b) -> bool:
+        """ returns if the buffered item at `a` is greater than the buffered item at `b` """
+        self.comparisons += 1
+        if self.events is not None:
+            self.events.extend((Ops.COMPARE_AUX, a, b))
+        return self.aux[a] > self.aux[b]
+
+    def copy_to_aux(self, start, end):
+        if len(self.aux) != self.item_num:
+            self.aux = [0] * self.item_num
+        self.aux[start:end] = self.items[start:end]
+        self.reads += end - start
+        self.aux_writes += end - start
+        if self.events is not None:
+            self.events.extend((Ops.COPY, start, end))
+
+    def swap_items(self, a, b, play_sound=True):
+        items = self.items
+        item_a, item_b = items[a], items[b]
+        items[a] = item_b
+        items[b] = item_a
+        self.swaps += 1
+        self.reads += 2
+        self.writes += 2
+        self.update_placed(a, item_b)
+        self.update_placed(b, item_a)
+        if self.events is not None:
+            self.events.extend((Ops.SWAP, a, b))
+
+        if play_sound:
+            self.play_sound(items[a])
+
+    def write_item(self, index, value, play_sound=True):
+        """ overwrite a single item """
+        self.items[index] = value
+        self.writes += 1
+        self.update_placed(index, value)
+        if self.events is not None:
+            self.events.extend((Ops.WRITE, index, value))
+
+        if play_sound:
+            self.play_sound(value)
+
+    def highlight(self, index):
+        """ flags an item whose completed state changed without it being written """
+        if self.events is not None:
+            self.events.extend((Ops.HIGHLIGHT, index, 0))
+
+    def update_placed(self, index, value):
+        if value == self.target[index]:
+            self.placed.add(index)
+        else:
+            self.placed.discard(index)
+
+    def play_sound(self, number):
+        if self.on_sound is not None:
+            self.on_sound(number)
@@ -0,0 +1,116 @@
+""" renders a sort off-screen as fast as it can, to numbered PNG frames or (if ffmpeg is installed) straight to a video.
+`python export.py --method Heap --items 300 --ops-per-frame 5 --out heap.mp4` """
+import argparse
+import os
+import shutil
+import subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # no display needed
+import pygame as pg
+
+from constants import *
+from datasets import get_distributions
+from methods import METHODS
+from sorter import Sorter
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".mov", ".avi", ".gif")
+
+
+class FrameWriter:
+    """ numbered PNGs in a directory """
+    def __init__(self, path):
+        self.path = path
+        self.frame_num = 0
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, frame: pg.Surface):
+        pg.image.save(frame, os.path.join(self.path, f"{self.frame_num:06d}.png"))
+        self.frame_num += 1
+
+    def close(self):
+        pass
+
+
+class VideoWriter:
+    """ raw RGB frames piped into ffmpeg """
+    def __init__(self, path, size: pg.Vector2, fps, ffmpeg):
+        self.path = path
+        self.frame_num = 0
+        self.process = subprocess.Popen([ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                                         "-s", f"{int(size.x)}x{int(size.y)}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", path],
+                                        stdin=subprocess.PIPE)
+
+    def write(self, frame: pg.Surface):
+        self.process.stdin.write(pg.image.tobytes(frame, "RGB"))
+        self.frame_num += 1
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with {self.process.returncode}")
+
+
+def get_writer(out, size: pg.Vector2, fps) -> FrameWriter | VideoWriter:
+    """ a video if `out` looks like one & ffmpeg is around, PNG frames otherwise """
+    if out.lower().endswith(VIDEO_EXTENSIONS):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is not None:
+            return VideoWriter(out, size, fps, ffmpeg)
+        out = os.path.splitext(out)[0] + "_frames"
+        print(f"ffmpeg not found, writing PNG frames to {out}")
+    return FrameWriter(out)
+
+
+def export(sorter: Sorter, writer: FrameWriter | VideoWriter, ops_per_frame=1, fps=60, hold=1.0) -> int:
+    """ renders the sorter's run a frame per `ops_per_frame` operations, holding the sorted frame for `hold` seconds.
+    returns the num of frames """
+    frame = pg.Surface(sorter.size)
+    sorter.render_all = True
+    sorter.render(frame)
+    writer.write(frame)
+
+    while not sorter.engine.run(ops_per_frame):
+        sorter.frame_num += 1
+        sorter.render(frame)
+        writer.write(frame)
+
+    sorter.frame_num += 1
+    sorter.render(frame, re_render_all=True)  # all green
+    for _ in range(max(1, round(hold * fps))):
+        writer.write(frame)
+    writer.close()
+    return writer.frame_num
+
+
+def main():
+    parser = argparse.ArgumentParser(description="export a sort to PNG frames or a video, without a display")
+    parser.add_argument("--method", default=SortingMethods.QUICK_HOARE, choices=list(METHODS), metavar="METHOD")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--distribution", default=Distributions.RANDOM, choices=get_distributions())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", help="replay this trace instead (see tracefile), ignores method, items & distribution")
+    parser.add_argument("--ops-per-frame", type=int, default=1)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--hold", type=float, default=1.0, help="seconds to hold the sorted frame for")
+    parser.add_argument("--margin", type=int, default=30)
+    parser.add_argument("--out", default="frames", help="a directory for PNG frames, or a video file (needs ffmpeg)")
+    args = parser.parse_args()
+
+    pg.init()
+    sorter = Sorter(None, pg.Vector2(0, 0), sound=False)
+    sorter.margin = args.margin
+    if args.trace:
+        sorter.load_trace(args.trace)
+    else:
+        sorter.engine.change_sorting_method(args.method)
+        sorter.item_num = args.items
+        sorter.engine.generate_items(args.items, args.distribution, args.seed)
+
+    writer = get_writer(args.out, sorter.size, args.fps)
+    frames = export(sorter, writer, max(1, args.ops_per_frame), args.fps, args.hold)
+    print(f"{frames} frames, {sorter.engine.operation_num} operations -> {writer.path}")
+    pg.quit()
+
+
+if __name__ == "__main__":
+    main()
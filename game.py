@@ -1,25 +1,42 @@
+import time
+
 import pygame as pg
-from interactable import BTNOperation, Button, ButtonToggle, Input, InputOperation, Collection
+from interactable import BTNOperation, Button, ButtonToggle, Input, InputOperation, Collection, HitIndex
+from race import Race
 from sorter import Sorter
 from constants import *
 from sound import SoundManager
+from textcache import render_text
+
 
+class MethodTitle:
+    """ the current sorting method, along the top left """
+    def __init__(self, pos: pg.Vector2, sorter, buttons, collection):
+        self.pos = pos
+        self.sorter = sorter
+        self.font_a = pg.font.SysFont(GameValues.FONT, 20)
+        self.font_b = pg.font.SysFont(GameValues.FONT, 30)
+        self.font_b.underline = True
 
-def get_render_method(pos: pg.Vector2, sorter, buttons, collection):
-    font_a = pg.font.SysFont(GameValues.FONT, 20)
-    font_b = pg.font.SysFont(GameValues.FONT, 30)
-    font_b.underline = True
+        self.title_text = self.font_a.render(Texts.SORTING_METHOD, True, (255, 255, 255))
+        self.rect = pg.Rect(pos, self.title_text.get_size())  # last drawn on
+        buttons.append(ButtonToggle(Texts.CHANGE, pg.Vector2(pos.x - 12, pos.y + 60), BTNOperation(collection=collection), text_size=15, text_margin=8))
 
-    title_text = font_a.render(Texts.SORTING_METHOD, True, (255, 255, 255))
-    buttons.append(ButtonToggle(Texts.CHANGE, pg.Vector2(pos.x - 12, pos.y + 60), BTNOperation(collection=collection), text_size=15, text_margin=8))
+    def get_method_text(self) -> pg.Surface:
+        return render_text(self.font_b, self.sorter.sorting_method + " " + Texts.SORT, (255, 255, 255))  # re-rendered only when changed
 
-    def render_method(screen: pg.Surface):
-        method_text = font_b.render(sorter.sorting_method + " " + Texts.SORT, True, (255, 255, 255))  # always refreshing
+    def get_state(self) -> tuple:
+        return self.sorter.sorting_method,
 
-        screen.blit(title_text, pos)
-        screen.blit(method_text, pg.Vector2(pos.x, pos.y + 30))
+    def get_rect(self) -> pg.Rect:
+        """ the old method text's too, it's cleared before the new one's drawn """
+        return self.rect.union(pg.Rect(self.pos.x, self.pos.y + 30, *self.get_method_text().get_size()))
 
-    return render_method
+    def render(self, screen: pg.Surface):
+        method_text = self.get_method_text()
+        screen.blit(self.title_text, self.pos)
+        screen.blit(method_text, pg.Vector2(self.pos.x, self.pos.y + 30))
+        self.rect = self.title_text.get_rect(topleft=self.pos).union(method_text.get_rect(topleft=(self.pos.x, self.pos.y + 30)))
 
 
 def get_buttons(game, sorter: Sorter):
@@ -34,7 +51,7 @@ def get_buttons(game, sorter: Sorter):
 
 def get_inputs(game, sorter: Sorter):
     items_num = Input(Texts.ITEMS_NUM, pg.Vector2(GameValues.SCREEN_WIDTH - 340, 20),
-                      InputOperation(function=sorter.change_item_num), int_only=True, default_val='50', max_val=GameValues.MAX_ITEMS, min_val=GameValues.MIN_ITEMS, validator=sorter.validator)
+                      InputOperation(function=sorter.change_item_num), int_only=True, default_val='50', max_value_chars=7, max_val=GameValues.MAX_ITEMS, min_val=GameValues.MIN_ITEMS, validator=sorter.validator)
     frames_per_op = Input(Texts.FRAMES_OP, pg.Vector2(GameValues.SCREEN_WIDTH - 200, 20),
                           InputOperation(function=sorter.change_frames_per_op), int_only=True, default_val='1', max_val=GameValues.MAX_FRAMES, min_val=GameValues.MIN_FRAMES)
     margin = Input(Texts.MARGIN, pg.Vector2(GameValues.SCREEN_WIDTH - 80, 20),
@@ -45,40 +62,77 @@ def get_inputs(game, sorter: Sorter):
 def get_collection(game, sorter: Sorter) -> Collection:
     size = 20
     col = (255, 255, 255)
+    methods = [
+        SortingMethods.BUBBLE, SortingMethods.COMB, SortingMethods.INSERTION, SortingMethods.COCKTAIL, SortingMethods.MERGE,
+        SortingMethods.SIMPLE_QUICK, SortingMethods.QUICK_LOMUTO, SortingMethods.QUICK_HOARE, SortingMethods.QUICK_RANDOM,
+        SortingMethods.HEAP, SortingMethods.INTRO, SortingMethods.TIM,
+        SortingMethods.RADIX, SortingMethods.RADIX_2, SortingMethods.RADIX_16, SortingMethods.RADIX_256
+    ]
     method_collection = Collection(pg.Vector2(6, 110), pg.Vector2(160, 590))
     method_collection.add_buttons([
-        Button(SortingMethods.BUBBLE, pg.Vector2(5, 5), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.BUBBLE), colour=col, text_size=size),
-        Button(SortingMethods.COMB, pg.Vector2(5, 35), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.COMB), colour=col, text_size=size),
-        Button(SortingMethods.INSERTION, pg.Vector2(5, 65), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.INSERTION), colour=col, text_size=size),
-        Button(SortingMethods.COCKTAIL, pg.Vector2(5, 95), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.COCKTAIL), colour=col, text_size=size),
-        Button(SortingMethods.MERGE, pg.Vector2(5, 125), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.MERGE), colour=col, text_size=size),
-        Button(SortingMethods.SIMPLE_QUICK, pg.Vector2(5, 155), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.SIMPLE_QUICK), colour=col, text_size=size),
-        Button(SortingMethods.HEAP, pg.Vector2(5, 185), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.HEAP), colour=col, text_size=size),
-        Button(SortingMethods.RADIX, pg.Vector2(5, 245), BTNOperation(function=sorter.change_sorting_method, method=SortingMethods.RADIX), colour=col, text_size=size)
+        Button(method, pg.Vector2(5, 5 + (i * 30)), BTNOperation(function=sorter.change_sorting_method, method=method), colour=col, text_size=size)
+        for i, method in enumerate(methods)
     ])
     return method_collection
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, race_methods: list[str] | None = None):
         self.running = True
-        self.fps = 120
+        self.fps = 120  # at most, presented
         self.clock = pg.time.Clock()
+        self.caption = ""
+        self.lag = 0.0  # seconds of simulation ticks still to run
         self.keys = pg.key.get_pressed()
 
-        self.canvas_screen = pg.Surface(pg.Vector2(GameValues.SCREEN_WIDTH, GameValues.SCREEN_HEIGHT))
         self.final_screen = pg.display.get_surface()
-
-        self.sorter = Sorter(self, pg.Vector2(175, 100))
+        if GameValues.RES_MUL == 1:
+            self.canvas_screen = self.final_screen  # drawn on directly, nothing to scale
+        else:
+            self.canvas_screen = pg.Surface(pg.Vector2(GameValues.SCREEN_WIDTH, GameValues.SCREEN_HEIGHT))
+        self.redraw = True  # everything, next render. on the first & whenever the window's contents are lost
+
+        if race_methods:
+            self.sorter = Race(self, pg.Vector2(175, 100), pg.Vector2(600, 600), race_methods)
+        else:
+            self.sorter = Sorter(self, pg.Vector2(175, 100))
         self.collection = get_collection(self, self.sorter)
         self.buttons = get_buttons(self, self.sorter)
         self.inputs = get_inputs(self, self.sorter)
-        self.render_method = get_render_method(pg.Vector2(10, 10), self.sorter, self.buttons, self.collection)
+        self.method_title = MethodTitle(pg.Vector2(10, 10), self.sorter, self.buttons, self.collection)
+
+        # retained, each is only re-rendered when its `get_state()` changes
+        self.widgets = [self.collection, *self.buttons, *self.inputs, self.method_title]
+        self.widget_states = {}
+
+        # what's under the mouse is looked up once per frame, not asked of every widget
+        self.hit_index = HitIndex([*self.collection.buttons, *self.buttons, *self.inputs])
+        self.hovered: Button | Input | None = None
 
         self.sound_manager = SoundManager()
 
-    def events(self):
-        for event in pg.event.get():
+    def get_events(self, wait=False) -> list[pg.event.Event]:
+        """ when waiting, sleeps until there's an event (or the timeout) instead of polling """
+        if wait:
+            event = pg.event.wait(GameValues.IDLE_WAIT)
+            if event.type == pg.NOEVENT:
+                return []
+            return [event] + pg.event.get()
+        return pg.event.get()
+
+    def hover(self, mouse_pos):
+        widget = self.hit_index.get(pg.Vector2(mouse_pos) / GameValues.RES_MUL)
+        if widget is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.hovered = False
+            if widget is not None:
+                widget.hovered = True
+            self.hovered = widget
+
+    def events(self, wait=False):
+        events = self.get_events(wait)
+        self.hover(pg.mouse.get_pos())
+        for event in events:
             # keydown input
             if event.type == pg.KEYDOWN:
                 self.keys = pg.key.get_pressed()
@@ -96,9 +150,17 @@ class Game:
                     elif should_start and self.sorter.started:
                         self.sorter.stop_sorting()
 
+                # scrub through a replay, shift for a single operation
+                if should_start and self.sorter.replaying and event.key in (pg.K_LEFT, pg.K_RIGHT):
+                    step = 1 if event.mod & pg.KMOD_SHIFT else max(1, self.sorter.engine.op_count // GameValues.SEEK_STEPS)
+                    self.sorter.seek(self.sorter.operation_num + (step if event.key == pg.K_RIGHT else -step))
+
                 if event.key == pg.K_m:
                     self.sound_manager.try_play_sound()
 
+            if event.type == pg.WINDOWEXPOSED:
+                self.redraw = True
+
             if event.type == pg.KEYUP:
                 self.keys = pg.key.get_pressed()
 
@@ -107,17 +169,28 @@ class Game:
                 self.running = False
 
             # mouse
-            if event.type == pg.MOUSEBUTTONDOWN and pg.mouse.get_pressed()[0]:
-                self.collection.mouse_down()
+            if event.type == pg.MOUSEBUTTONDOWN and event.button == pg.BUTTON_LEFT:
+                self.hover(event.pos)
                 for inpt in self.inputs:
-                    inpt.mouse_down()
-                for button in self.buttons:
-                    if button.should_perform_op():
-                        button.perform_operation()
-                        return
-
-    def update(self):
-        self.sorter.update()
+                    if inpt is not self.hovered:
+                        inpt.de_select()
+                if self.hovered is not None:
+                    self.hovered.mouse_down()
+                    self.hover(event.pos)  # it may have been hidden & swapped for another (start / stop)
+
+    def update(self, elapsed: float = 1 / GameValues.SIM_RATE):
+        """ frames / op counts simulation ticks at `GameValues.SIM_RATE`, whatever rate frames are presented at.
+        at max speed the sorter sorts for a share of the time that's passed instead, so it's a share of the wall time too """
+        if self.sorter.frames_per_op == 0:
+            self.lag = 0.0
+            self.sorter.update(min(elapsed * GameValues.MAX_SPEED_SHARE, GameValues.MAX_SPEED_BUDGET))
+            return
+
+        tick = 1 / GameValues.SIM_RATE
+        self.lag = min(self.lag + elapsed, tick * GameValues.MAX_TICKS_PER_FRAME)  # a slow frame doesn't snowball
+        while self.lag >= tick:
+            self.sorter.update()
+            self.lag -= tick
 
     def start_sorting(self):
         if not self.sorter.completed:
@@ -144,31 +217,65 @@ class Game:
     def change_item_num_input(self, value):
         self.inputs[0].change_value(value)
 
-    def render(self):
-        self.final_screen.fill(Colours.BG_COL)
-        self.canvas_screen.fill(Colours.BG_COL)
-
-        self.collection.render(self.canvas_screen)
-        for button in self.buttons:
-            button.render(self.canvas_screen)
-        for inpt in self.inputs:
-            inpt.render(self.canvas_screen)
-
-        self.sorter.render(self.canvas_screen)
-        self.render_method(self.canvas_screen)
+    def render_widgets(self) -> list[pg.Rect]:
+        """ re-renders the widgets that changed, and any they overlap. returns the rects changed """
+        rects = []
+        for widget in self.widgets:
+            state = widget.get_state()
+            if state != self.widget_states.get(widget):
+                self.widget_states[widget] = state
+                rects.append(widget.get_rect())
+        if not rects:
+            return rects
+
+        # clearing one can wipe part of another (start & stop share a spot), those are redrawn whole too
+        to_render = [widget for widget in self.widgets if widget.get_rect().collidelist(rects) != -1]
+        rects = [widget.get_rect() for widget in to_render] + rects
+        for rect in rects:
+            self.canvas_screen.fill(Colours.BG_COL, rect)
+        for widget in to_render:
+            widget.render(self.canvas_screen)
+        return rects
 
-        # final
-        scaled = pg.transform.scale(self.canvas_screen, pg.Vector2(GameValues.SCREEN_WIDTH * GameValues.RES_MUL, GameValues.SCREEN_HEIGHT * GameValues.RES_MUL))
-        self.final_screen.blit(scaled, pg.Vector2(0, 0))
-
-        pg.display.flip()
+    def render(self):
+        if self.redraw:
+            self.canvas_screen.fill(Colours.BG_COL)
+            self.widget_states.clear()
+
+        rects = self.render_widgets()
+        rects += self.sorter.render(self.canvas_screen, re_render_all=self.redraw)
+
+        # final, only what changed is scaled & pushed to the display
+        rects = [rect.clip(self.canvas_screen.get_rect()) for rect in rects]
+        if GameValues.RES_MUL != 1:
+            for rect in rects:
+                scaled = pg.transform.scale(self.canvas_screen.subsurface(rect), pg.Vector2(rect.size) * GameValues.RES_MUL)
+                self.final_screen.blit(scaled, pg.Vector2(rect.topleft) * GameValues.RES_MUL)
+            rects = [pg.Rect(pg.Vector2(rect.topleft) * GameValues.RES_MUL, pg.Vector2(rect.size) * GameValues.RES_MUL) for rect in rects]
+
+        if self.redraw:
+            pg.display.flip()
+            self.redraw = False
+        elif rects:
+            pg.display.update(rects)
 
     def main_loop(self):
+        last = time.perf_counter()
         while self.running:
-            self.events()
-            self.update()
+            idle = not self.sorter.started  # nothing moves by itself, only redraw on events
+            self.events(wait=idle)
+
+            now = time.perf_counter()
+            self.update(0.0 if idle else now - last)
+            last = now
             self.render()
 
-            self.clock.tick(self.fps)
+            if idle:
+                self.clock.tick()  # already waited on events
+            else:
+                self.clock.tick(self.fps)
 
-            pg.display.set_caption("{} - fps: {:.2f}".format("sort stuff idk", self.clock.get_fps()))
+            caption = "{} - fps: {:.0f}".format("sort stuff idk", self.clock.get_fps())
+            if caption != self.caption:
+                self.caption = caption
+                pg.display.set_caption(caption)
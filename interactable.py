@@ -1,7 +1,8 @@
-import math
+from collections import defaultdict
 
 import pygame as pg
 from constants import *
+from textcache import dim, get_font, render_text
 
 
 class BTNOperation:
@@ -41,6 +42,28 @@ class InputOperation:
         return f"InputOperation({self.function.__name__})"
 
 
+class HitIndex:
+    """ widgets by the grid cells their mouse bounds cover, so finding the one under the mouse only checks those in its cell """
+    def __init__(self, widgets=(), cell_size=GameValues.HIT_CELL):
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list] = defaultdict(list)
+        for widget in widgets:
+            self.add(widget)
+
+    def add(self, widget):
+        bounds = widget.get_mouse_bounds()
+        for x in range(bounds.left // self.cell_size, (bounds.right - 1) // self.cell_size + 1):
+            for y in range(bounds.top // self.cell_size, (bounds.bottom - 1) // self.cell_size + 1):
+                self.cells[(x, y)].append(widget)
+
+    def get(self, pos):
+        """ the visible widget at `pos` (screen coords) if any """
+        for widget in self.cells.get((int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size), ()):
+            if not widget._hidden and widget.get_mouse_bounds().collidepoint(pos):
+                return widget
+        return None
+
+
 class Collection:
     """ A collection of buttons within a separate screen that can be toggled on and off """
     def __init__(self, pos: pg.Vector2, size: pg.Vector2, buttons=None, toggled=False):
@@ -73,14 +96,17 @@ class Collection:
         for btn in self.buttons:
             btn._hidden = not self.toggled
 
-    def mouse_down(self):
-        for btn in self.buttons:
-            btn.perform_operation()
-
     def toggle_active(self, val):
         for btn in self.buttons:
             btn._active = val
 
+    def get_state(self) -> tuple:
+        """ everything that changes how it looks, it's only re-rendered when this changes """
+        return self.toggled, tuple(btn.get_state() for btn in self.buttons)
+
+    def get_rect(self) -> pg.Rect:
+        return pg.Rect(self.pos, self.size)
+
     def render(self, screen: pg.Surface):
         self.coll_screen.fill(Colours.BG_COL)
         if self.toggled:
@@ -98,7 +124,7 @@ class Button:
                  text_size=30, colour=(255, 255, 0), text_margin=5,
                  override_size: pg.Vector2 | None = None, outline=0,
                  hidden=False, active=True):
-        self.font = pg.font.SysFont(GameValues.FONT, text_size)
+        self.font = get_font(text_size)
 
         self.margin = text_margin
         self.operation = operation
@@ -106,7 +132,7 @@ class Button:
         self._active = active
 
         self.text = text
-        self.colour: pg.Color = pg.Color(colour)
+        self.colour = tuple(pg.Color(colour))
         self.outline = outline
 
         display_text = self.font.render(text, True, colour)
@@ -118,6 +144,8 @@ class Button:
             self.bounds.size = override_size
             self.size = pg.Vector2(self.bounds.size)
         self.mouse_offset = pg.Vector2(0, 0)
+        self.mouse_bounds = self.bounds.copy()  # bounds on the screen, for `HitIndex`
+        self.hovered = False  # set by the game, once per frame
 
         self.text_pos = pg.Vector2(self.bounds.topleft) + pg.Vector2(self.margin * .5)
 
@@ -125,9 +153,11 @@ class Button:
         self.pos = new_pos
         self.bounds = pg.Rect(new_pos.x + self.margin, new_pos.y + self.margin, self.size.x, self.size.y)
         self.text_pos = pg.Vector2(self.bounds.topleft) + pg.Vector2(self.margin * .5)
+        self.mouse_bounds = self.bounds.move(self.mouse_offset)
 
     def change_mouse_offset(self, new_off: pg.Vector2):
         self.mouse_offset = new_off
+        self.mouse_bounds = self.bounds.move(self.mouse_offset)
 
     def set_hidden(self, val: bool):
         self._hidden = val
@@ -136,11 +166,16 @@ class Button:
         self._active = val
 
     def get_col(self, given_col=None):
-        col = pg.Color(given_col if given_col else self.colour)
-        if not self._active:
-            m = 0.3
-            col.update(math.ceil(col.r * m), math.ceil(col.g * m), math.ceil(col.b * m))
-        return col
+        col = given_col if given_col else self.colour
+        return col if self._active else dim(col)
+
+    def get_state(self) -> tuple:
+        if self._hidden:
+            return True,
+        return False, self._active, self.is_mouse_in_bounds(), self.text
+
+    def get_rect(self) -> pg.Rect:
+        return self.bounds
 
     def render(self, screen: pg.Surface):
         if not self._hidden:
@@ -150,10 +185,10 @@ class Button:
             if self.outline:
                 pg.draw.rect(screen, self.get_col(), self.bounds, self.outline)
 
-            screen.blit(self.font.render(self.text, True, self.get_col()), self.text_pos)
+            screen.blit(render_text(self.font, self.text, self.get_col()), self.text_pos)
 
-    def get_mouse_bounds(self):
-        return pg.Rect(self.bounds.topleft + self.mouse_offset, self.bounds.size)
+    def get_mouse_bounds(self) -> pg.Rect:
+        return self.mouse_bounds
 
     def get_operation(self):
         if self.is_mouse_in_bounds():
@@ -164,10 +199,7 @@ class Button:
             pg.draw.rect(screen, self.get_col((50, 50, 50)), self.bounds)
 
     def is_mouse_in_bounds(self):
-        mp = pg.Vector2(pg.mouse.get_pos()) / GameValues.RES_MUL
-        bounds = self.get_mouse_bounds()
-        return (bounds.x < mp.x < bounds.x + bounds.width
-                and bounds.y < mp.y < bounds.y + bounds.height)
+        return self.hovered
 
     def should_perform_op(self):
         return self.is_mouse_in_bounds() and not self._hidden and self._active
@@ -176,6 +208,9 @@ class Button:
         if self.should_perform_op():
             self.operation.perform_operation()
 
+    def mouse_down(self):
+        self.perform_operation()
+
 
 class ButtonToggle(Button):
     def __init__(self, *args, **kwargs):
@@ -188,6 +223,9 @@ class ButtonToggle(Button):
         if self.is_mouse_in_bounds() and not self._hidden and self._active:
             self.toggled = not self.toggled
 
+    def get_state(self) -> tuple:
+        return super().get_state() + (self.toggled,)
+
     def render(self, screen: pg.Surface):
         super().render(screen)
         if self.toggled:
@@ -198,10 +236,10 @@ class Input:
     def __init__(self, text, pos: pg.Vector2, operation: InputOperation,
                  text_size=20, text_col=(255, 255, 0), max_value_chars=3, int_only=False, margin=5,
                  default_val="", max_val=0, min_val=0, hidden=False, active=True, validator=str):
-        self.font = pg.font.SysFont(GameValues.FONT, text_size)
+        self.font = get_font(text_size)
 
         self.text = text
-        self.colour: pg.Color = pg.Color(text_col)
+        self.colour = tuple(pg.Color(text_col))
         self.margin = margin
         self.operation = operation
         self._hidden = hidden
@@ -219,6 +257,8 @@ class Input:
         self.box_bounds = pg.Rect(pos.x, text_size + pos.y + margin, (text_size * max_value_chars) * 0.8, text_size + margin)
         display_text = self.font.render(text, True, text_col)
         self.text_pos = pg.Vector2(get_middle(pos.x, self.box_bounds.width, display_text.get_width()), pos.y)
+        self.rect = self.box_bounds.union(pg.Rect(self.text_pos, display_text.get_size()))  # all it draws on
+        self.hovered = False
 
         self.de_select()  # load defaults
 
@@ -241,11 +281,8 @@ class Input:
             self.de_select()
 
     def get_col(self, given_col=None):
-        col = pg.Color(given_col if given_col else self.colour)
-        if not self._active:
-            m = 0.3
-            col.update(math.ceil(col.r * m), math.ceil(col.g * m), math.ceil(col.b * m))
-        return col
+        col = given_col if given_col else self.colour
+        return col if self._active else dim(col)
 
     def de_select(self):
         if self.selected:
@@ -273,6 +310,14 @@ class Input:
     def set_active(self, val: bool):
         self._active = val
 
+    def get_state(self) -> tuple:
+        if self._hidden:
+            return True,
+        return False, self._active, self.is_mouse_in_bounds(), self.selected, self.value
+
+    def get_rect(self) -> pg.Rect:
+        return self.rect
+
     def render(self, screen: pg.Surface):
         if not self._hidden:
             pg.draw.rect(screen, self.get_col((50, 50, 50)), self.box_bounds)
@@ -282,15 +327,16 @@ class Input:
                 pg.draw.rect(screen, (255, 255, 255), self.box_bounds, 2)
 
             # text
-            screen.blit(self.font.render(self.text, True, self.get_col()), self.text_pos)
-            value_text = self.font.render(self.value, True, self.get_col())
+            screen.blit(render_text(self.font, self.text, self.get_col()), self.text_pos)
+            value_text = render_text(self.font, self.value, self.get_col())
             screen.blit(value_text, pg.Vector2(get_middle(self.box_bounds.x, self.box_bounds.width, value_text.get_width()), self.box_bounds.y))
 
     def mouse_hover(self, screen: pg.Surface):
         if self.is_mouse_in_bounds():
             pg.draw.rect(screen, self.get_col((100, 100, 100)), self.box_bounds)
 
+    def get_mouse_bounds(self) -> pg.Rect:
+        return self.box_bounds
+
     def is_mouse_in_bounds(self):
-        mp = pg.Vector2(pg.mouse.get_pos()) / GameValues.RES_MUL
-        return (self.box_bounds.x < mp.x < self.box_bounds.x + self.box_bounds.width
-                and self.box_bounds.y < mp.y < self.box_bounds.y + self.box_bounds.height)
+        return self.hovered
@@ -1,7 +1,10 @@
+import argparse
+
 import pygame as pg
 
 from game import Game
 from constants import *
+from methods import METHODS
 
 game: Game | None = None
 
@@ -9,10 +12,21 @@ game: Game | None = None
 def main():
     global game
 
+    parser = argparse.ArgumentParser(description="sorting algorithms")
+    parser.add_argument("trace", nargs="?", help="replay this trace (see tracefile)")
+    parser.add_argument("--record", metavar="PATH", help="record each run started to this trace (the latest run is kept)")
+    parser.add_argument("--race", nargs="+", choices=list(METHODS), metavar="METHOD", help="race these methods on the same items")
+    args = parser.parse_args()
+
     pg.init()
+    # a plain window, vsync needs pg.SCALED whose renderer flips the whole window on every update & drops the dirty rects
     pg.display.set_mode(pg.Vector2(GameValues.SCREEN_WIDTH * GameValues.RES_MUL, GameValues.SCREEN_HEIGHT * GameValues.RES_MUL))
 
-    game = Game()
+    game = Game(args.race)
+    if args.trace and not args.race:
+        game.sorter.load_trace(args.trace)
+    elif args.record and not args.race:
+        game.sorter.record_path = args.record
     game.main_loop()
 
     pg.quit()
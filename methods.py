@@ -0,0 +1,572 @@
+import random
+from functools import partial
+from itertools import accumulate
+from typing import TYPE_CHECKING, Callable, Generator
+
+from constants import *
+
+if TYPE_CHECKING:
+    from engine import SortEngine
+
+Operations = Generator[tuple[int, int, int], bool | None, None]
+IndexOperations = Generator[tuple[int, int, int], bool | None, int]  # operations then an index (or length), via `yield from`
+
+
+class MethodSorter:
+    """ (theoretical) abstract class, a method is a generator (`sort`) of (op, a, b) operations (see `Ops`) which the engine
+    performs one per step. `yield Ops.COMPARE, a, b` evaluates to whether the item at a is greater than the item at b """
+    def __init__(self, engine: "SortEngine"):
+        self.engine = engine
+        self.operations = self.sort()
+
+    def sort(self) -> Operations:
+        yield from ()
+
+    def validator(self, value: int) -> str:
+        return str(value)
+
+    def get_looking_at_items(self) -> set[int]:
+        """ the items of the last operation """
+        op = self.engine.last_op
+        if op is None:
+            return set()
+        if op[0] == Ops.COPY:
+            return set()
+        return {op[1]} if op[0] == Ops.WRITE or op[0] == Ops.HIGHLIGHT else {op[1], op[2]}
+
+    def get_completed_items(self) -> set[int]:
+        """ items in their final position, kept up to date by the engine (do not modify) """
+        return self.engine.placed
+
+
+class BubbleSorter(MethodSorter):
+    def sort(self) -> Operations:
+        for end in range(self.engine.item_num - 1, 0, -1):
+            swapped = False
+            for i in range(end):
+                if (yield Ops.COMPARE, i, i + 1):
+                    yield Ops.SWAP, i, i + 1
+                    swapped = True
+            if not swapped:
+                return
+
+
+class CombSort(MethodSorter):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.shrink_factor = 1.3
+
+    def sort(self) -> Operations:
+        # bubble sort over a shrinking gap, finishing with passes of gap 1 until nothing is swapped
+        gap, swapped = self.engine.item_num, True
+        while gap > 1 or swapped:
+            gap = max(1, int(gap / self.shrink_factor))
+            swapped = False
+            for i in range(self.engine.item_num - gap):
+                if (yield Ops.COMPARE, i, i + gap):
+                    yield Ops.SWAP, i, i + gap
+                    swapped = True
+
+
+class InsertionSort(MethodSorter):
+    @staticmethod
+    def sort_range(lo, hi) -> Operations:
+        """ items[lo:hi], also used by the hybrids on small ranges """
+        for up_to_column in range(lo + 1, hi):
+            i = up_to_column
+            while i > lo and (yield Ops.COMPARE, i - 1, i):
+                yield Ops.SWAP, i - 1, i
+                i -= 1
+
+    def sort(self) -> Operations:
+        yield from self.sort_range(0, self.engine.item_num)
+
+
+class CocktailSort(MethodSorter):
+    def sort(self) -> Operations:
+        lo, hi = 0, self.engine.item_num - 1
+        while lo < hi:
+            # ascending
+            swapped = False
+            for i in range(lo, hi):
+                if (yield Ops.COMPARE, i, i + 1):
+                    yield Ops.SWAP, i, i + 1
+                    swapped = True
+            hi -= 1
+            if not swapped:
+                return
+
+            # descending
+            swapped = False
+            for i in range(hi, lo, -1):
+                if (yield Ops.COMPARE, i - 1, i):
+                    yield Ops.SWAP, i - 1, i
+                    swapped = True
+            lo += 1
+            if not swapped:
+                return
+
+
+class MergeSort(MethodSorter):
+    """ bottom-up merge of neighbouring runs, each row is copied into the engine's auxiliary buffer and merged back in place """
+    @staticmethod
+    def split_odd(bounds: list[int]) -> list[int]:
+        """ odd no. of runs, split midd run into two """
+        runs = len(bounds) - 1
+        if runs % 2 and runs > 1:
+            mid = (runs - 1) // 2
+            bounds.insert(mid + 1, bounds[mid] + (bounds[mid + 1] - bounds[mid]) // 2)
+        return bounds
+
+    def sort(self) -> Operations:
+        item_num = self.engine.item_num
+        bounds = self.split_odd(list(range(item_num + 1)))  # run i is items[bounds[i]:bounds[i + 1]]
+
+        while len(bounds) > 2:
+            yield Ops.COPY, 0, item_num
+            aux = self.engine.aux
+            for i in range(0, len(bounds) - 1, 2):
+                left, left_end = bounds[i], bounds[i + 1]
+                right, right_end = bounds[i + 1], bounds[i + 2]
+
+                # if both runs aren't empty, move lowest, else move item in run that isn't empty
+                for write_at in range(left, right_end):
+                    if right == right_end or (left < left_end and not (yield Ops.COMPARE_AUX, left, right)):
+                        item = aux[left]
+                        left += 1
+                    else:
+                        item = aux[right]
+                        right += 1
+                    yield Ops.WRITE, write_at, item
+
+            bounds = self.split_odd(bounds[::2])
+
+    def validator(self, value: int) -> str:
+        # even numbers only
+        return str(int(value) + (value % 2))
+
+
+class SimpleQuickSort(MethodSorter):
+    """ last item as the pivot, larger items are swapped past it as it shifts down one place at a time """
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.locked_in = set()
+
+    def lock(self, index) -> Operations:
+        self.locked_in.add(index)
+        yield Ops.HIGHLIGHT, index, 0
+
+    def sort(self) -> Operations:
+        ranges = [(0, self.engine.item_num - 1)]
+        while ranges:
+            lo, hi = ranges.pop()
+            if lo == hi:
+                yield from self.lock(lo)
+            if lo >= hi:
+                continue
+
+            pivot, left = hi, lo
+            while left < pivot:
+                if (yield Ops.COMPARE, left, pivot):
+                    if left != pivot - 1:
+                        yield Ops.SWAP, pivot - 1, pivot
+                    yield Ops.SWAP, left, pivot
+                    pivot -= 1
+                else:
+                    left += 1
+
+            yield from self.lock(pivot)
+            ranges.extend(((pivot + 1, hi), (lo, pivot - 1)))
+
+    def get_completed_items(self) -> set[int]:
+        return self.locked_in
+
+
+class QuickSort(MethodSorter):
+    """ partitions ranges popped off an explicit stack (no recursion) """
+    def __init__(self, *args, partition=Partitions.HOARE, pivot=Pivots.MEDIAN_OF_THREE, seed=0):
+        super().__init__(*args)
+        self.partition = partition
+        self.pivot_strategy = pivot
+        self.random = random.Random(seed)  # random pivots are the same every run of the same items, so traces replay them
+        self.locked_in = set()
+
+    def lock(self, index) -> Operations:
+        self.locked_in.add(index)
+        yield Ops.HIGHLIGHT, index, 0
+
+    def choose_pivot(self, lo, hi) -> IndexOperations:
+        """ returns the index of the pivot """
+        if self.pivot_strategy == Pivots.RANDOM:
+            return self.random.randint(lo, hi)
+        if self.pivot_strategy == Pivots.MEDIAN_OF_THREE and hi - lo > 1:
+            # order the first, middle & last items in place, leaving the median in the middle
+            mid = (lo + hi) // 2
+            for a, b in ((lo, mid), (mid, hi), (lo, mid)):
+                if (yield Ops.COMPARE, a, b):
+                    yield Ops.SWAP, a, b
+            return mid
+        return hi
+
+    def partition_lomuto(self, lo, hi) -> IndexOperations:
+        """ pivot at `hi`, smaller items are swapped to the front. returns the pivot's final index """
+        store = lo
+        for i in range(lo, hi):
+            if (yield Ops.COMPARE, hi, i):
+                if store != i:
+                    yield Ops.SWAP, store, i
+                store += 1
+
+        if store != hi:
+            yield Ops.SWAP, store, hi
+        return store
+
+    def partition_hoare(self, lo, hi) -> IndexOperations:
+        """ pivot at `lo`, scans in from either end swapping items on the wrong side (Sedgewick). returns the pivot's final index """
+        left, right = lo, hi + 1
+        while True:
+            left += 1
+            while (yield Ops.COMPARE, lo, left) and left != hi:
+                left += 1
+            right -= 1
+            while (yield Ops.COMPARE, right, lo) and right != lo:
+                right -= 1
+            if left >= right:
+                break
+            yield Ops.SWAP, left, right
+
+        if right != lo:
+            yield Ops.SWAP, lo, right
+        return right
+
+    def split(self, lo, hi) -> IndexOperations:
+        """ partitions items[lo:hi + 1] around a pivot & locks it in. returns the pivot's final index """
+        # move the pivot to the end it's kept at during partitioning
+        pivot = yield from self.choose_pivot(lo, hi)
+        end = hi if self.partition == Partitions.LOMUTO else lo
+        if pivot != end:
+            yield Ops.SWAP, pivot, end
+
+        if self.partition == Partitions.LOMUTO:
+            pivot = yield from self.partition_lomuto(lo, hi)
+        else:
+            pivot = yield from self.partition_hoare(lo, hi)
+        yield from self.lock(pivot)
+        return pivot
+
+    def sort(self) -> Operations:
+        ranges = [(0, self.engine.item_num - 1)]  # pending (lo, hi) ranges, inclusive
+        while ranges:
+            lo, hi = ranges.pop()
+            if lo == hi:
+                yield from self.lock(lo)
+            if lo >= hi:
+                continue
+
+            pivot = yield from self.split(lo, hi)
+
+            # push the larger side first so the smaller is partitioned next, keeping the stack O(log n)
+            below, above = (lo, pivot - 1), (pivot + 1, hi)
+            ranges.extend((below, above) if pivot - lo > hi - pivot else (above, below))
+
+    def get_completed_items(self) -> set[int]:
+        return self.locked_in
+
+
+class HeapSort(MethodSorter):
+    """ builds a max heap bottom-up (Floyd), then repeatedly swaps the root to the end of the heap and sifts its replacement down """
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.path: set[int] = set()  # highlighted, the current sift's path & end of the heap
+
+    def sift_down(self, parent, heap_size, lo=0) -> Operations:
+        """ swap the item with its larger child while that's larger than it, adding each to `path`. indices are relative to the heap's
+        start, `lo` """
+        while (child := (2 * parent) + 1) < heap_size:
+            if child + 1 < heap_size and (yield Ops.COMPARE, lo + child + 1, lo + child):
+                child += 1
+            if not (yield Ops.COMPARE, lo + child, lo + parent):
+                return
+            yield Ops.SWAP, lo + child, lo + parent
+            self.path.add(lo + child)
+            parent = child
+
+    def sort_range(self, lo, hi) -> Operations:
+        """ items[lo:hi], also used by introsort """
+        item_num = hi - lo
+
+        # heapify, sift down every parent from the last one
+        for parent in range(item_num // 2 - 1, -1, -1):
+            self.path = {lo + parent}
+            yield from self.sift_down(parent, item_num, lo)
+
+        # move largest to the end, then sift down its replacement
+        for heap_size in range(item_num - 1, 0, -1):
+            yield Ops.SWAP, lo, lo + heap_size
+            self.path = {lo, lo + heap_size}  # & the largest, just swapped out of the heap
+            yield from self.sift_down(0, heap_size, lo)
+        self.path = set()
+
+    def sort(self) -> Operations:
+        yield from self.sort_range(0, self.engine.item_num)
+
+    def get_looking_at_items(self) -> set[int]:
+        return self.path
+
+
+class RadixSort(MethodSorter):
+    """ least significant digit first, each pass is copied into the engine's auxiliary buffer and its digits counted so every item
+    is written straight into its bucket """
+    def __init__(self, *args, base=10):
+        super().__init__(*args)
+        self.base = base
+
+    def sort(self) -> Operations:
+        base, item_num = self.base, self.engine.item_num
+        yield Ops.COPY, 0, item_num  # the first pass, read through the engine so finding the range is counted too
+        buffer = self.engine.aux
+        minimum = min(buffer, default=0)  # digits are of `item - minimum`, so negatives work too
+        span = max(buffer, default=0) - minimum
+
+        divisor = 1  # base ** digit
+        while divisor <= span:
+            if divisor > 1:
+                yield Ops.COPY, 0, item_num  # the pass being bucketed
+                buffer = self.engine.aux
+
+            # next write position of each bucket, a prefix sum of the digit counts
+            counts = [0] * base
+            for item in buffer:
+                counts[((item - minimum) // divisor) % base] += 1
+            offsets = [0, *accumulate(counts)][:-1]
+
+            # put items in their buckets
+            for item in buffer:
+                digit = ((item - minimum) // divisor) % base
+                yield Ops.WRITE, offsets[digit], item
+                offsets[digit] += 1
+            divisor *= base
+
+
+class IntroSort(QuickSort):
+    """ quick sort (Musser) that heap sorts any range partitioned deeper than 2 log2(n), so it's never quadratic, and insertion sorts
+    ranges of `insertion_size` or fewer, where partitioning costs more than it saves """
+    def __init__(self, *args, insertion_size=16):
+        super().__init__(*args)
+        self.insertion_size = insertion_size
+        self.heap = HeapSort(self.engine)  # its sift path is highlighted while heap sorting
+
+    def lock_range(self, lo, hi) -> Operations:
+        for i in range(lo, hi + 1):
+            yield from self.lock(i)
+
+    def sort(self) -> Operations:
+        item_num = self.engine.item_num
+        ranges = [(0, item_num - 1, 2 * (max(1, item_num).bit_length() - 1))]  # pending (lo, hi, depth left), inclusive
+        while ranges:
+            lo, hi, depth = ranges.pop()
+            if hi - lo < self.insertion_size:
+                yield from InsertionSort.sort_range(lo, hi + 1)
+                yield from self.lock_range(lo, hi)
+                continue
+            if depth == 0:
+                yield from self.heap.sort_range(lo, hi + 1)
+                yield from self.lock_range(lo, hi)
+                continue
+
+            pivot = yield from self.split(lo, hi)
+            below, above = (lo, pivot - 1, depth - 1), (pivot + 1, hi, depth - 1)
+            ranges.extend((below, above) if pivot - lo > hi - pivot else (above, below))
+
+    def get_looking_at_items(self) -> set[int]:
+        return self.heap.path or super().get_looking_at_items()
+
+
+class TimSort(MethodSorter):
+    """ finds the natural runs (reversing descending ones), extends short ones to `min_run` with binary insertion, then merges
+    neighbouring runs as they're found, keeping the run lengths balanced (Peters). merging gallops through a run once one side
+    keeps winning, so long stretches already in order are copied across without comparing each item """
+    def __init__(self, *args, min_gallop=7):
+        super().__init__(*args)
+        self.gallop_after = min_gallop  # wins in a row before galloping
+        self.min_gallop = min_gallop  # the same, adapted to how well galloping pays off
+        self.runs: list[tuple[int, int]] = []  # pending (start, length)
+
+    @staticmethod
+    def get_min_run(n) -> int:
+        """ n / min run is a power of 2 or just under, so the final merges are balanced """
+        extra = 0
+        while n >= 64:
+            extra |= n & 1
+            n >>= 1
+        return n + extra
+
+    def count_run(self, lo, hi) -> IndexOperations:
+        """ length of the run starting at lo, reversed in place if strictly descending (ties would lose their order otherwise) """
+        run_end = lo + 1
+        if run_end == hi:
+            return 1
+        if (yield Ops.COMPARE, lo, run_end):
+            while run_end + 1 < hi and (yield Ops.COMPARE, run_end, run_end + 1):
+                run_end += 1
+            a, b = lo, run_end
+            while a < b:
+                yield Ops.SWAP, a, b
+                a, b = a + 1, b - 1
+        else:
+            while run_end + 1 < hi and not (yield Ops.COMPARE, run_end, run_end + 1):
+                run_end += 1
+        return run_end + 1 - lo
+
+    def binary_insertion(self, lo, start, hi) -> Operations:
+        """ items[lo:start] are sorted, inserts each of items[start:hi] after any equal items. found by binary search, then swapped
+        down into place so the items it passes are counted by the engine like any other """
+        for i in range(start, hi):
+            left, right = lo, i
+            while left < right:
+                mid = (left + right) // 2
+                if (yield Ops.COMPARE, mid, i):
+                    right = mid
+                else:
+                    left = mid + 1
+            for j in range(i, left, -1):
+                yield Ops.SWAP, j - 1, j
+
+    @staticmethod
+    def gallop(compare, key, start, end, left) -> IndexOperations:
+        """ where `key` goes in the sorted range [start, end): before equal items if `left`, after them otherwise. probes 1, 3, 7...
+        items from `start` then binary searches the last step, so it's cheap when the answer is near the start """
+        def goes_before(i) -> Generator[tuple[int, int, int], bool | None, bool]:
+            if left:
+                return not (yield compare, key, i)
+            return (yield compare, i, key)
+
+        lo, probe, step = start, start, 1
+        while probe < end and not (yield from goes_before(probe)):
+            lo = probe + 1
+            step *= 2
+            probe = start + step - 1
+        hi = min(probe, end)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (yield from goes_before(mid)):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def merge_at(self, i) -> Operations:
+        """ merges runs i & i + 1 """
+        (a, a_len), (b, b_len) = self.runs[i], self.runs[i + 1]
+        end = b + b_len
+        self.runs[i:i + 2] = [(a, a_len + b_len)]
+
+        # items of a before b's first & of b after a's last are already in place
+        a = yield from self.gallop(Ops.COMPARE, b, a, b, False)
+        end = yield from self.gallop(Ops.COMPARE, b - 1, b, end, True)
+        if a == b or b == end:
+            return
+
+        yield Ops.COPY, a, end
+        aux, write_at = self.engine.aux, a
+        a_end, min_gallop = b, self.min_gallop
+        while a < a_end and b < end:
+            # one at a time, until a side wins `min_gallop` in a row
+            a_wins = b_wins = 0
+            while a < a_end and b < end and a_wins < min_gallop and b_wins < min_gallop:
+                if (yield Ops.COMPARE_AUX, a, b):
+                    yield Ops.WRITE, write_at, aux[b]
+                    b += 1
+                    a_wins, b_wins = 0, b_wins + 1
+                else:
+                    yield Ops.WRITE, write_at, aux[a]
+                    a += 1
+                    a_wins, b_wins = a_wins + 1, 0
+                write_at += 1
+
+            # galloping, whole stretches of a side at once while it pays
+            while a < a_end and b < end:
+                a_to = yield from self.gallop(Ops.COMPARE_AUX, b, a, a_end, False)
+                for i in range(a, a_to):
+                    yield Ops.WRITE, write_at, aux[i]
+                    write_at += 1
+                a_count, a = a_to - a, a_to
+                if a == a_end:
+                    break
+
+                b_to = yield from self.gallop(Ops.COMPARE_AUX, a, b, end, True)
+                for i in range(b, b_to):
+                    yield Ops.WRITE, write_at, aux[i]
+                    write_at += 1
+                b_count, b = b_to - b, b_to
+
+                if a_count < self.gallop_after and b_count < self.gallop_after:
+                    min_gallop += 1  # not paying off, harder to start galloping again
+                    break
+                min_gallop = max(1, min_gallop - 1)
+
+        # what's left of b is already in place
+        for i in range(a, a_end):
+            yield Ops.WRITE, write_at, aux[i]
+            write_at += 1
+        self.min_gallop = min_gallop
+
+    def merge_collapse(self) -> Operations:
+        """ merges until every run is longer than the next two together & the next, so lengths at least grow like fibonacci """
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+            elif runs[n][1] > runs[n + 1][1]:
+                return
+            yield from self.merge_at(n)
+
+    def sort(self) -> Operations:
+        item_num = self.engine.item_num
+        min_run = self.get_min_run(item_num)
+        lo = 0
+        while lo < item_num:
+            run = yield from self.count_run(lo, item_num)
+            if run < min_run:
+                forced = min(min_run, item_num - lo)
+                yield from self.binary_insertion(lo, lo + run, lo + forced)
+                run = forced
+            self.runs.append((lo, run))
+            yield from self.merge_collapse()
+            lo += run
+
+        while len(self.runs) > 1:
+            yield from self.merge_at(len(self.runs) - 2)
+        self.runs.clear()
+
+    def get_looking_at_items(self) -> set[int]:
+        """ the last operation's items & the start of each pending run """
+        return super().get_looking_at_items() | {start for start, _ in self.runs}
+
+
+METHODS: dict[str, Callable[["SortEngine"], MethodSorter]] = {
+    SortingMethods.BUBBLE: BubbleSorter,
+    SortingMethods.COMB: CombSort,
+    SortingMethods.INSERTION: InsertionSort,
+    SortingMethods.COCKTAIL: CocktailSort,
+    SortingMethods.MERGE: MergeSort,
+    SortingMethods.SIMPLE_QUICK: SimpleQuickSort,
+    SortingMethods.QUICK_LOMUTO: partial(QuickSort, partition=Partitions.LOMUTO),
+    SortingMethods.QUICK_HOARE: partial(QuickSort, partition=Partitions.HOARE),
+    SortingMethods.QUICK_RANDOM: partial(QuickSort, pivot=Pivots.RANDOM),
+    SortingMethods.HEAP: HeapSort,
+    SortingMethods.INTRO: IntroSort,
+    SortingMethods.TIM: TimSort,
+    SortingMethods.RADIX: RadixSort,
+    SortingMethods.RADIX_2: partial(RadixSort, base=2),
+    SortingMethods.RADIX_16: partial(RadixSort, base=16),
+    SortingMethods.RADIX_256: partial(RadixSort, base=256)
+}
+
+
+def get_method_sorter(sorting_method) -> Callable[["SortEngine"], MethodSorter]:
+    if sorting_method not in METHODS:
+        raise ValueError(f"method {sorting_method} is not registered. look at methods.METHODS")
+    return METHODS[sorting_method]
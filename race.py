@@ -0,0 +1,119 @@
+import math
+import time
+
+import pygame as pg
+
+import datasets
+from constants import *
+from sorter import Sorter
+
+
+class Race:
+    """ sorters tiled side by side on the same items, in place of a `Sorter`. they step together, a frame per op or at max
+    speed the same num of ops each frame (sized to fit the frame) so the race is fair """
+    def __init__(self, game, pos: pg.Vector2, size: pg.Vector2, methods: list[str]):
+        self.game = game
+        columns = math.ceil(math.sqrt(len(methods)))
+        rows = math.ceil(len(methods) / columns)
+        tile = pg.Vector2(size.x // columns, size.y // rows)
+
+        self.sorters: list[Sorter] = []
+        for i, method in enumerate(methods):
+            sorter = Sorter(None, pos + pg.Vector2((i % columns) * tile.x, (i // columns) * tile.y), sound=False, size=tile, title=method)
+            sorter.engine.change_sorting_method(method)
+            self.sorters.append(sorter)
+
+        self.item_num = 1
+        self.distribution = Distributions.RANDOM
+        self.seed = 0
+        self.started = False
+        self.frames_per_op = 0
+        self.frames_since_op = 0
+        self.ops_per_frame = 256  # each, at max speed. adapts to the budget `update` is given
+
+    replaying = False  # of traces, one sorter at a time
+
+    @property
+    def sorting_method(self):
+        return Texts.RACE
+
+    @property
+    def completed(self) -> bool:
+        return all(sorter.completed for sorter in self.sorters)
+
+    def validator(self, value) -> str:
+        # satisfy every method
+        for sorter in self.sorters:
+            value = int(sorter.validator(value))
+        return str(value)
+
+    def generate_items(self):
+        if not self.started:
+            items = datasets.load(self.distribution, self.item_num, self.seed, cache=False)
+            self.seed += 1
+            for sorter in self.sorters:
+                sorter.item_num = self.item_num
+                sorter.engine.load_items(items)
+                sorter.frame_num = 0
+                sorter.render_all = True
+
+    def change_item_num(self, new_num):
+        self.item_num = new_num
+        self.generate_items()
+
+    def change_frames_per_op(self, new_val):
+        self.frames_per_op = new_val
+
+    def change_margin(self, new_val):
+        for sorter in self.sorters:
+            sorter.change_margin(new_val)
+
+    def change_sorting_method(self, method):
+        """ the methods are fixed once racing """
+
+    def start_sorting(self):
+        if not self.completed:
+            self.started = True
+            for sorter in self.sorters:
+                sorter.start_sorting()
+
+    def stop_sorting(self):
+        if self.started:
+            self.started = False
+            for sorter in self.sorters:
+                sorter.stop_sorting()
+            self.game.stop_sorting()
+
+    def toggle_sound(self):
+        pass  # silent, there'd be one tone per sorter
+
+    def update(self, budget=GameValues.MAX_SPEED_BUDGET):
+        """ `budget` is the seconds all the sorters share when frames / op is 0 """
+        if not self.started:
+            return
+
+        running = [sorter for sorter in self.sorters if sorter.started]
+        self.frames_since_op += 1
+        if self.frames_per_op == 0:
+            start = time.perf_counter()
+            for sorter in running:
+                sorter.engine.run(self.ops_per_frame)
+            elapsed = time.perf_counter() - start
+            if budget > 0:  # none on the frame sorting starts
+                self.ops_per_frame = max(1, int(self.ops_per_frame * min(2.0, budget / max(elapsed, 1e-6))))
+            self.frames_since_op = 0
+        elif self.frames_since_op >= self.frames_per_op:
+            for sorter in running:
+                sorter.engine.step()
+            self.frames_since_op = 0
+
+        for sorter in running:
+            sorter.frame_num += 1
+            sorter.frames_since_op = self.frames_since_op
+
+        # finished sorters stop themselves
+        if not any(sorter.started for sorter in self.sorters):
+            self.stop_sorting()
+
+    def render(self, screen: pg.Surface, re_render_all=False) -> list[pg.Rect]:
+        return [rect for sorter in self.sorters for rect in sorter.render(screen, re_render_all)]
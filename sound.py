@@ -1,8 +1,13 @@
+import threading
+from collections import deque
+
 from pysinewave import SineWave
 
 
 class SoundManager:
-    def __init__(self):
+    """ the sine wave is only touched by its own thread. changes are posted to single slot mailboxes (the newest replaces any
+    not yet applied) which the thread applies once per block, so sorting never waits on sound however fast it goes """
+    def __init__(self, block_time=0.01):
         self.sound_on = False
 
         self.pitch_upper_limit = 20
@@ -11,9 +16,28 @@ class SoundManager:
 
         self.sine_wave = SineWave(pitch=0, decibels=self.decibels_lower_limit, decibels_per_second=1000, pitch_per_second=1000)
 
+        # deque appends & pops are atomic, no lock needed
+        self.pitches = deque(maxlen=1)
+        self.volumes = deque(maxlen=1)
+        self.block_time = block_time  # seconds between applying changes
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.audio_loop, name="sound", daemon=True)
+
         # init
         self.toggle_sound(False)
         self.sine_wave.play()
+        self.thread.start()
+
+    def audio_loop(self):
+        while not self.stopped.wait(self.block_time):
+            if self.volumes:
+                self.sine_wave.set_volume(self.volumes.pop())
+            if self.pitches:
+                self.sine_wave.set_pitch(self.pitches.pop())
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
 
     def toggle_sound(self, toggle=None):
         self.sound_on = toggle if toggle is not None else not self.sound_on
@@ -22,7 +46,7 @@ class SoundManager:
     def change_volume(self, volume=None):
         if self.sound_on:
             volume = volume if volume is not None else self.decibels_lower_limit
-            self.sine_wave.set_volume(volume)
+            self.volumes.append(volume)
 
     def change_pitch(self, pitch):
-        self.sine_wave.set_pitch(pitch)
+        self.pitches.append(pitch)
@@ -0,0 +1,84 @@
+""" every method on every distribution, headless. `python -m pytest tests` """
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+import datasets
+from constants import *
+from engine import SortEngine
+from methods import METHODS, TimSort
+
+SIZES = [0, 1, 2, 3, 63, 64, 65, 300]  # timsort's min run changes at 64
+KEY = 100_000  # items of `KeyEngine` are key * KEY + original index
+
+
+class KeyEngine(SortEngine):
+    """ compares items by key only, so the order equal keys end in shows if a method is stable """
+    def compare(self, a, b) -> bool:
+        self.comparisons += 1
+        return self.items[a] // KEY > self.items[b] // KEY
+
+    def compare_aux(self, a, b) -> bool:
+        self.comparisons += 1
+        return self.aux[a] // KEY > self.aux[b] // KEY
+
+
+def run_ops(operations, items):
+    """ answers a generator's compares on a plain list, returns what it returns """
+    try:
+        kind, a, b = next(operations)
+        while True:
+            assert kind == Ops.COMPARE
+            kind, a, b = operations.send(items[a] > items[b])
+    except StopIteration as stop:
+        return stop.value
+
+
+@pytest.mark.parametrize("distribution", datasets.get_distributions())
+@pytest.mark.parametrize("method", list(METHODS))
+def test_sorts(method, distribution):
+    for size in SIZES:
+        engine = SortEngine(method)
+        engine.generate_items(size, distribution, seed=size, cache=False)
+        items = list(engine.items)
+        assert engine.run()
+        assert list(engine.items) == sorted(items), size
+
+
+@pytest.mark.parametrize("distribution", datasets.get_distributions())
+def test_tim_sort_is_stable(distribution):
+    for size in (65, 1000):
+        keys = datasets.generate(distribution, size, random.Random(size))
+        engine = KeyEngine(SortingMethods.TIM)
+        engine.load_items([(key % 8) * KEY + i for i, key in enumerate(keys)])  # few keys, lots of ties
+        engine.run()
+        assert list(engine.items) == sorted(engine.items)  # the index breaks ties, so only stable is sorted
+
+
+def test_gallop():
+    items = [1, 1, 2, 3, 3, 3, 5, 8, 8, 13, 21, 21, 21, 21, 34]
+    for key in range(0, 36):
+        for start in range(len(items)):
+            for end in range(start, len(items) + 1):
+                search = items[:] + [key]
+                left = run_ops(TimSort.gallop(Ops.COMPARE, len(items), start, end, True), search)
+                right = run_ops(TimSort.gallop(Ops.COMPARE, len(items), start, end, False), search)
+                assert left == bisect_left(items, key, start, end)
+                assert right == bisect_right(items, key, start, end)
+
+
+def test_tim_sort_gallops_through_blocks():
+    # two runs of interleaving blocks, once galloping each block is found in log(block) compares instead of one per item
+    block, blocks = 100, 20
+    run_a = [i for b in range(0, blocks, 2) for i in range(b * block, (b + 1) * block)]
+    run_b = [i for b in range(1, blocks, 2) for i in range(b * block, (b + 1) * block)]
+    engine = SortEngine(SortingMethods.TIM)
+    engine.load_items(run_a + run_b)
+    engine.run()
+
+    item_num = block * blocks
+    assert list(engine.items) == list(range(item_num))
+    assert engine.comparisons < item_num + item_num // 4  # finding the runs takes n - 1, merging one at a time would be ~n more
+    assert engine.method.runs == [] and engine.method.min_gallop >= 1
+
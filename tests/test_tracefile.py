@@ -0,0 +1,51 @@
+""" traces replay & seek to exactly what a live run went through """
+import random
+
+import pytest
+
+from constants import *
+from datasets import generate
+from engine import SortEngine
+from methods import METHODS
+from tracefile import TracePlayer, pack_items, read_varint, record, unzigzag, zigzag
+
+
+def test_varints():
+    values = [0, 1, -1, 63, -64, 64, 127, 128, 300, -300, 2 ** 31, -2 ** 40, 2 ** 63 - 1, -2 ** 63]
+    data = pack_items(values)
+    pos = 0
+    for value in values:
+        packed, pos = read_varint(data, pos)
+        assert unzigzag(packed) == value
+        assert zigzag(value) >= 0
+    assert pos == len(data)
+
+
+@pytest.mark.parametrize("method", list(METHODS))
+def test_round_trip(method, tmp_path):
+    path = str(tmp_path / "run.trace")
+    for items in ([], [1], [-5, 3, 3, 100_000, -2 ** 40, 0, 9], generate(Distributions.RANDOM, 300, random.Random(0))):
+        ops = record(method, items, path, snapshot_every=50)  # small, so seeking crosses lots of snapshots
+
+        # every state of a live run
+        engine = SortEngine(method)
+        engine.load_items(items)
+        states, counters = [list(engine.items)], [engine.get_counters()]
+        while not engine.run(1):
+            states.append(list(engine.items))
+            counters.append(engine.get_counters())
+        states.append(list(engine.items))
+        counters.append(engine.get_counters())
+        assert engine.operation_num == ops
+
+        player = TracePlayer(path)
+        assert player.sorting_method == method and player.op_count == ops
+        assert player.run()
+        assert list(player.items) == sorted(items)
+        assert player.get_counters() == engine.get_counters()
+
+        # forwards & back
+        for op_index in random.Random(1).sample(range(ops + 1), min(ops + 1, 30)):
+            player.seek(op_index)
+            assert list(player.items) == states[op_index], op_index
+            assert player.get_counters() == counters[op_index]
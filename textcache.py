@@ -0,0 +1,25 @@
+""" text surfaces shared by every widget & the HUD, so unchanged text is rendered once and then only blitted """
+import math
+from functools import lru_cache
+
+import pygame as pg
+
+from constants import *
+
+
+@lru_cache(maxsize=32)
+def get_font(size) -> pg.font.Font:
+    """ shared, don't modify (underline etc), make a font of your own for that """
+    return pg.font.SysFont(GameValues.FONT, size)
+
+
+@lru_cache(maxsize=1024)
+def render_text(font: pg.font.Font, text: str, colour: tuple, antialias=True) -> pg.Surface:
+    """ least recently used are dropped once full. shared, don't draw on the surface """
+    return font.render(text, antialias, colour)
+
+
+@lru_cache(maxsize=64)
+def dim(colour: tuple, m=0.3) -> tuple:
+    """ colour of an inactive widget """
+    return tuple(math.ceil(c * m) for c in colour[:3])
@@ -0,0 +1,256 @@
+""" record & replay of sorting runs. a trace is the items a run started from & every operation after, varint packed, with
+periodic snapshots of the items so playback can seek without re-running the method.
+`record(SortingMethods.HEAP, items, "heap.trace")`, then `TracePlayer("heap.trace")` steps like a `SortEngine` """
+import mmap
+import struct
+from array import array
+
+from constants import *
+from engine import COUNTERS, SortEngine
+from methods import MethodSorter
+
+MAGIC = b"SORTTRC"
+VERSION = 1
+FLUSH_SIZE = 1 << 20  # bytes of packed operations buffered before writing
+
+
+def zigzag(value) -> int:
+    """ signed -> unsigned, small either way stays small """
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def unzigzag(value) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def write_varint(buffer: bytearray, value):
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, pos) -> tuple[int, int]:
+    """ returns the value & the position after it """
+    value, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def pack_items(items, counters=()) -> bytearray:
+    buffer = bytearray()
+    for item in items:
+        write_varint(buffer, zigzag(item))
+    for counter in counters:
+        write_varint(buffer, counter)
+    return buffer
+
+
+class TraceWriter:
+    """ writes the operations an engine performs from now on, events are taken as the engine's events are (`take_events()`)
+    and the trace is finished once the run completes or the items are reloaded.
+
+    layout: magic, header (version, method, item num, snapshot interval, items), packed operations, snapshots, footer
+    (op num, [op index, operations offset, previous index, snapshot offset] per snapshot), footer offset as a u64 """
+    def __init__(self, engine: SortEngine, path, snapshot_every=None):
+        self.engine = engine
+        self.snapshot_every = snapshot_every or max(4096, engine.item_num * 2)  # ops, snapshots add about half the size of the ops
+
+        # replays every op to know the items (& counters) at each snapshot
+        self.shadow = SortEngine(engine.sorting_method)
+        self.shadow.load_items(engine.items)
+        self.shadow.aux = list(engine.aux)
+
+        self.file = open(path, "wb")
+        header = bytearray(MAGIC)
+        name = engine.sorting_method.encode()
+        for value in (VERSION, len(name)):
+            write_varint(header, value)
+        header += name
+        for value in (engine.item_num, self.snapshot_every):
+            write_varint(header, value)
+        header += pack_items(engine.items)
+        self.file.write(header)
+
+        self.buffer = bytearray()
+        self.written = 0  # bytes of operations written to the file
+        self.op_num = 0
+        self.previous = 0  # last op's first index, each op stores its index as a difference from it
+        self.snapshots: list[tuple[int, int, int, bytes]] = []
+
+        # events already logged were performed before the trace started
+        if engine.events is None:
+            engine.record_events()
+        self.skip = len(engine.events)
+        engine.trace = self
+
+    def write_events(self, events: array):
+        """ flat (op, a, b) triples, see `SortEngine.events` """
+        buffer, shadow, every = self.buffer, self.shadow, self.snapshot_every
+        op_num, previous = self.op_num, self.previous
+        for i in range(self.skip, len(events), 3):
+            kind, a, b = events[i], events[i + 1], events[i + 2]
+            if op_num and op_num % every == 0:
+                self.snapshot(op_num, previous)
+
+            write_varint(buffer, (zigzag(a - previous) << 3) | kind)
+            write_varint(buffer, zigzag(b if kind == Ops.WRITE or kind == Ops.HIGHLIGHT else b - a))
+            previous = a
+            shadow.apply(kind, a, b)
+            op_num += 1
+
+            if len(buffer) >= FLUSH_SIZE:
+                self.flush()
+        self.op_num, self.previous, self.skip = op_num, previous, 0
+
+    def snapshot(self, op_num, previous):
+        shadow = self.shadow
+        counters = [getattr(shadow, counter) for counter in COUNTERS]
+        self.snapshots.append((op_num, self.written + len(self.buffer), previous, bytes(pack_items(shadow.items, counters))))
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.written += len(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        """ write any events not taken yet & finish the file """
+        if self.engine.trace is not self:
+            return
+        self.engine.trace = None
+        if self.engine.events:
+            self.write_events(self.engine.events)
+        self.flush()
+
+        footer = bytearray()
+        write_varint(footer, self.op_num)
+        write_varint(footer, len(self.snapshots))
+        offset = self.file.tell()
+        for op_num, op_offset, previous, data in self.snapshots:
+            self.file.write(data)
+            for value in (op_num, op_offset, previous, offset):
+                write_varint(footer, value)
+            offset += len(data)
+
+        self.file.write(footer)
+        self.file.write(struct.pack("<Q", offset))
+        self.file.close()
+
+
+def record(sorting_method, items, path, snapshot_every=None, batch=4096) -> int:
+    """ run a method on `items` headlessly, writing its trace. returns the num of operations """
+    engine = SortEngine(sorting_method)
+    engine.load_items(items)
+    TraceWriter(engine, path, snapshot_every)
+    while not engine.run(batch):
+        engine.take_events()
+    return engine.operation_num
+
+
+class TracePlayer(SortEngine):
+    """ steps through a trace file (memory mapped) as if it was running the method, `seek()` to jump to any operation.
+    loading items or changing method just rewinds, the trace decides both """
+    def __init__(self, path, on_sound=None, on_complete=None, typed_items=False):
+        super().__init__(on_sound=on_sound, on_complete=on_complete, typed_items=typed_items)
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self.data
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a trace")
+
+        # header
+        version, pos = read_varint(data, len(MAGIC))
+        if version != VERSION:
+            raise ValueError(f"{path} is trace version {version}, only {VERSION} can be read")
+        length, pos = read_varint(data, pos)
+        self.sorting_method = data[pos:pos + length].decode()
+        self.item_num, pos = read_varint(data, pos + length)
+        self.snapshot_every, pos = read_varint(data, pos)
+        self.initial, pos = self.read_items(pos)
+        self.ops_start = pos
+
+        # footer, the start (op index 0) is the first snapshot
+        pos = struct.unpack("<Q", data[-8:])[0]
+        self.op_count, pos = read_varint(data, pos)
+        snapshot_num, pos = read_varint(data, pos)
+        self.snapshots: list[tuple[int, int, int, int]] = [(0, 0, 0, -1)]  # op index, operations offset, previous, snapshot offset
+        for _ in range(snapshot_num):
+            snapshot = []
+            for _ in range(4):
+                value, pos = read_varint(data, pos)
+                snapshot.append(value)
+            self.snapshots.append(tuple(snapshot))
+
+        self.pos = self.ops_start  # of the next op
+        self.previous = 0
+        self.seek(0)
+
+    def read_items(self, pos) -> tuple[list[int], int]:
+        items = []
+        for _ in range(self.item_num):
+            value, pos = read_varint(self.data, pos)
+            items.append(unzigzag(value))
+        return items, pos
+
+    def load_items(self, items=None):
+        self.seek(0)
+
+    def seek(self, op_index):
+        """ jump to just before the operation at `op_index`, from the nearest snapshot before it """
+        op_index = max(0, min(op_index, self.op_count))
+        op_num, offset, previous, snapshot_offset = max(s for s in self.snapshots if s[0] <= op_index)
+
+        counters = [0] * len(COUNTERS)
+        if snapshot_offset < 0:
+            items = self.initial
+        else:
+            items, pos = self.read_items(snapshot_offset)
+            for i in range(len(counters)):
+                counters[i], pos = read_varint(self.data, pos)
+
+        self.items = array('q', items) if self.typed_items else list(items)
+        self.target = array('q', sorted(items)) if self.typed_items else sorted(items)
+        self.placed = {i for i, (item, t) in enumerate(zip(self.items, self.target)) if item == t}
+        self.aux = [0] * self.item_num  # comparisons aren't needed in a replay, any buffered items will do before a copy
+        self.method = MethodSorter(self)
+        self.completed = False
+        self.operation_num = op_num
+        for counter, value in zip(COUNTERS, counters):
+            setattr(self, counter, value)
+        self.last_op, self.result = None, None
+        self.pos, self.previous = self.ops_start + offset, previous
+
+        # replay up to the index, quietly, those events are of no interest
+        on_sound, self.on_sound = self.on_sound, None
+        self.run(op_index - op_num)
+        self.on_sound = on_sound
+        if self.events is not None:
+            self.events = array('q')
+
+    def run(self, max_ops=None) -> bool:
+        if self.completed:
+            return True
+
+        data, pos, previous = self.data, self.pos, self.previous
+        remaining = self.op_count - self.operation_num
+        ops = remaining if max_ops is None else min(max_ops, remaining)
+        op = self.last_op
+        for _ in range(ops):
+            head, pos = read_varint(data, pos)
+            value, pos = read_varint(data, pos)
+            kind, a = head & 7, previous + unzigzag(head >> 3)
+            b = unzigzag(value) if kind == Ops.WRITE or kind == Ops.HIGHLIGHT else a + unzigzag(value)
+            previous = a
+            op = (kind, a, b)
+            self.apply(kind, a, b)
+
+        self.pos, self.previous, self.last_op = pos, previous, op
+        self.operation_num += ops
+        if self.operation_num == self.op_count and max_ops != 0:
+            self.complete_sorting()
+        return self.completed